@@ -1,20 +1,51 @@
-from flask import Flask, render_template, redirect, url_for, flash, request, abort
+import os
+from flask import (Flask, Blueprint, Response, current_app, render_template, redirect, url_for, flash, request, abort,
+                   jsonify, send_file)
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from functools import wraps
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.utils import secure_filename
 from datetime import datetime
-from config import Config
-from models import db, User, Student, Company, PlacementDrive, Application
+from config import config
+from models import (db, User, Student, Company, PlacementDrive, Application, ChangeLog, TRACKED_MODELS, ARCHIVE_MODELS,
+                    ArchivedPlacementDrive, ArchivedApplication)
+from maintenance import purge_company, purge_student, purge_drive, suspend_company, run_in_background
+from storage import UploadRequest, save_resume, resume_path, stream_zip
 
-app = Flask(__name__)
-app.config.from_object(Config)
+bp = Blueprint('main', __name__)
 
-db.init_app(app)
 login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
+login_manager.login_view = 'main.login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'warning'
 
+# ==================== APPLICATION FACTORY ====================
+
+def create_app(config_name=None):
+    """Build the app for a config profile; schema and seed data are handled by init_db.py."""
+    app = Flask(__name__)
+    app.config.from_object(config[config_name or 'default'])
+    app.request_class = UploadRequest
+    
+    # Must be set before the Jinja environment is first created
+    cache_dir = app.config['TEMPLATE_BYTECODE_CACHE_DIR']
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(cache_dir)}
+    
+    db.init_app(app)
+    login_manager.init_app(app)
+    app.register_blueprint(bp)
+    
+    if app.config['TEMPLATE_WARMUP']:
+        warm_templates(app)
+    return app
+
+def warm_templates(app):
+    """Compile every template up front so the first requests don't pay for it."""
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(name)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -47,21 +78,21 @@ def student_required(f):
 
 # ==================== AUTH ROUTES ====================
 
-@app.route('/')
+@bp.route('/')
 def index():
     if current_user.is_authenticated:
         if current_user.role == 'admin':
-            return redirect(url_for('admin_dashboard'))
+            return redirect(url_for('main.admin_dashboard'))
         elif current_user.role == 'company':
-            return redirect(url_for('company_dashboard'))
+            return redirect(url_for('main.company_dashboard'))
         elif current_user.role == 'student':
-            return redirect(url_for('student_dashboard'))
+            return redirect(url_for('main.student_dashboard'))
     return render_template('index.html')
 
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'POST':
         email = request.form.get('email')
@@ -72,38 +103,38 @@ def login():
         if user and user.check_password(password):
             if not user.is_active:
                 flash('Your account has been deactivated. Please contact admin.', 'danger')
-                return redirect(url_for('login'))
+                return redirect(url_for('main.login'))
             
             # Check if company is approved
             if user.role == 'company':
                 company = Company.query.filter_by(user_id=user.id).first()
                 if company and company.approval_status != 'approved':
                     flash('Your company registration is pending approval.', 'warning')
-                    return redirect(url_for('login'))
+                    return redirect(url_for('main.login'))
                 if company and company.is_blacklisted:
                     flash('Your company has been blacklisted. Please contact admin.', 'danger')
-                    return redirect(url_for('login'))
+                    return redirect(url_for('main.login'))
             
             # Check if student is blacklisted
             if user.role == 'student':
                 student = Student.query.filter_by(user_id=user.id).first()
                 if student and student.is_blacklisted:
                     flash('Your account has been blacklisted. Please contact admin.', 'danger')
-                    return redirect(url_for('login'))
+                    return redirect(url_for('main.login'))
             
             login_user(user)
             flash('Login successful!', 'success')
             next_page = request.args.get('next')
-            return redirect(next_page or url_for('index'))
+            return redirect(next_page or url_for('main.index'))
         else:
             flash('Invalid email or password.', 'danger')
     
     return render_template('auth/login.html')
 
-@app.route('/register/student', methods=['GET', 'POST'])
+@bp.route('/register/student', methods=['GET', 'POST'])
 def register_student():
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'POST':
         email = request.form.get('email')
@@ -118,15 +149,15 @@ def register_student():
         # Validation
         if password != confirm_password:
             flash('Passwords do not match.', 'danger')
-            return redirect(url_for('register_student'))
+            return redirect(url_for('main.register_student'))
         
         if User.query.filter_by(email=email).first():
             flash('Email already registered.', 'danger')
-            return redirect(url_for('register_student'))
+            return redirect(url_for('main.register_student'))
         
         if Student.query.filter_by(roll_number=roll_number).first():
             flash('Roll number already registered.', 'danger')
-            return redirect(url_for('register_student'))
+            return redirect(url_for('main.register_student'))
         
         # Create user
         user = User(email=email, role='student')
@@ -147,14 +178,14 @@ def register_student():
         db.session.commit()
         
         flash('Registration successful! Please login.', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     
     return render_template('auth/register_student.html')
 
-@app.route('/register/company', methods=['GET', 'POST'])
+@bp.route('/register/company', methods=['GET', 'POST'])
 def register_company():
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'POST':
         email = request.form.get('email')
@@ -170,11 +201,11 @@ def register_company():
         # Validation
         if password != confirm_password:
             flash('Passwords do not match.', 'danger')
-            return redirect(url_for('register_company'))
+            return redirect(url_for('main.register_company'))
         
         if User.query.filter_by(email=email).first():
             flash('Email already registered.', 'danger')
-            return redirect(url_for('register_company'))
+            return redirect(url_for('main.register_company'))
         
         # Create user
         user = User(email=email, role='company')
@@ -197,20 +228,20 @@ def register_company():
         db.session.commit()
         
         flash('Registration successful! Please wait for admin approval.', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     
     return render_template('auth/register_company.html')
 
-@app.route('/logout')
+@bp.route('/logout')
 @login_required
 def logout():
     logout_user()
     flash('You have been logged out.', 'info')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
 # ==================== ADMIN ROUTES ====================
 
-@app.route('/admin/dashboard')
+@bp.route('/admin/dashboard')
 @login_required
 @admin_required
 def admin_dashboard():
@@ -229,7 +260,7 @@ def admin_dashboard():
                            pending_companies=pending_companies,
                            pending_drives=pending_drives)
 
-@app.route('/admin/companies')
+@bp.route('/admin/companies')
 @login_required
 @admin_required
 def admin_companies():
@@ -240,7 +271,7 @@ def admin_companies():
         companies = Company.query.all()
     return render_template('admin/companies.html', companies=companies, search=search)
 
-@app.route('/admin/companies/<int:id>/approve', methods=['POST'])
+@bp.route('/admin/companies/<int:id>/approve', methods=['POST'])
 @login_required
 @admin_required
 def approve_company(id):
@@ -248,9 +279,9 @@ def approve_company(id):
     company.approval_status = 'approved'
     db.session.commit()
     flash(f'Company "{company.name}" has been approved.', 'success')
-    return redirect(url_for('admin_companies'))
+    return redirect(url_for('main.admin_companies'))
 
-@app.route('/admin/companies/<int:id>/reject', methods=['POST'])
+@bp.route('/admin/companies/<int:id>/reject', methods=['POST'])
 @login_required
 @admin_required
 def reject_company(id):
@@ -258,9 +289,9 @@ def reject_company(id):
     company.approval_status = 'rejected'
     db.session.commit()
     flash(f'Company "{company.name}" has been rejected.', 'warning')
-    return redirect(url_for('admin_companies'))
+    return redirect(url_for('main.admin_companies'))
 
-@app.route('/admin/companies/<int:id>/blacklist', methods=['POST'])
+@bp.route('/admin/companies/<int:id>/blacklist', methods=['POST'])
 @login_required
 @admin_required
 def blacklist_company(id):
@@ -269,22 +300,27 @@ def blacklist_company(id):
     db.session.commit()
     status = 'blacklisted' if company.is_blacklisted else 'removed from blacklist'
     flash(f'Company "{company.name}" has been {status}.', 'info')
-    return redirect(url_for('admin_companies'))
+    return redirect(url_for('main.admin_companies'))
 
-@app.route('/admin/companies/<int:id>/delete', methods=['POST'])
+@bp.route('/admin/companies/<int:id>/delete', methods=['POST'])
 @login_required
 @admin_required
 def delete_company(id):
     company = Company.query.get_or_404(id)
-    user = User.query.get(company.user_id)
-    db.session.delete(company)
-    if user:
-        db.session.delete(user)
-    db.session.commit()
-    flash('Company has been deleted.', 'success')
-    return redirect(url_for('admin_companies'))
+    application_count = Application.query.join(PlacementDrive).filter(PlacementDrive.company_id == company.id).count()
+    
+    if company.deletion_pending or application_count > current_app.config['BULK_DELETE_BACKGROUND_THRESHOLD']:
+        # Lock the company out right away; the rows are removed in chunks
+        suspend_company(company.id)
+        run_in_background(current_app._get_current_object(), purge_company, company.id, chunk_size=current_app.config['BULK_DELETE_CHUNK_SIZE'])
+        flash('Company deletion has been started in the background. '
+              'If it is still listed as pending later, delete it again to resume.', 'info')
+    else:
+        purge_company(company.id)
+        flash('Company has been deleted.', 'success')
+    return redirect(url_for('main.admin_companies'))
 
-@app.route('/admin/students')
+@bp.route('/admin/students')
 @login_required
 @admin_required
 def admin_students():
@@ -299,7 +335,7 @@ def admin_students():
         students = Student.query.all()
     return render_template('admin/students.html', students=students, search=search)
 
-@app.route('/admin/students/<int:id>/blacklist', methods=['POST'])
+@bp.route('/admin/students/<int:id>/blacklist', methods=['POST'])
 @login_required
 @admin_required
 def blacklist_student(id):
@@ -308,22 +344,18 @@ def blacklist_student(id):
     db.session.commit()
     status = 'blacklisted' if student.is_blacklisted else 'removed from blacklist'
     flash(f'Student "{student.name}" has been {status}.', 'info')
-    return redirect(url_for('admin_students'))
+    return redirect(url_for('main.admin_students'))
 
-@app.route('/admin/students/<int:id>/delete', methods=['POST'])
+@bp.route('/admin/students/<int:id>/delete', methods=['POST'])
 @login_required
 @admin_required
 def delete_student(id):
     student = Student.query.get_or_404(id)
-    user = User.query.get(student.user_id)
-    db.session.delete(student)
-    if user:
-        db.session.delete(user)
-    db.session.commit()
+    purge_student(student.id)
     flash('Student has been deleted.', 'success')
-    return redirect(url_for('admin_students'))
+    return redirect(url_for('main.admin_students'))
 
-@app.route('/admin/students/<int:id>/edit', methods=['GET', 'POST'])
+@bp.route('/admin/students/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 @admin_required
 def edit_student(id):
@@ -335,17 +367,18 @@ def edit_student(id):
         student.cgpa = float(request.form.get('cgpa', 0))
         db.session.commit()
         flash('Student updated successfully.', 'success')
-        return redirect(url_for('admin_students'))
+        return redirect(url_for('main.admin_students'))
     return render_template('admin/edit_student.html', student=student)
 
-@app.route('/admin/drives')
+@bp.route('/admin/drives')
 @login_required
 @admin_required
 def admin_drives():
-    drives = PlacementDrive.query.all()
-    return render_template('admin/drives.html', drives=drives)
+    archived = request.args.get('archived', type=int) == 1
+    drives = ArchivedPlacementDrive.query.all() if archived else PlacementDrive.query.all()
+    return render_template('admin/drives.html', drives=drives, archived=archived)
 
-@app.route('/admin/drives/<int:id>/approve', methods=['POST'])
+@bp.route('/admin/drives/<int:id>/approve', methods=['POST'])
 @login_required
 @admin_required
 def approve_drive(id):
@@ -353,9 +386,9 @@ def approve_drive(id):
     drive.status = 'approved'
     db.session.commit()
     flash(f'Placement drive "{drive.job_title}" has been approved.', 'success')
-    return redirect(url_for('admin_drives'))
+    return redirect(url_for('main.admin_drives'))
 
-@app.route('/admin/drives/<int:id>/reject', methods=['POST'])
+@bp.route('/admin/drives/<int:id>/reject', methods=['POST'])
 @login_required
 @admin_required
 def reject_drive(id):
@@ -363,18 +396,19 @@ def reject_drive(id):
     drive.status = 'rejected'
     db.session.commit()
     flash(f'Placement drive "{drive.job_title}" has been rejected.', 'warning')
-    return redirect(url_for('admin_drives'))
+    return redirect(url_for('main.admin_drives'))
 
-@app.route('/admin/applications')
+@bp.route('/admin/applications')
 @login_required
 @admin_required
 def admin_applications():
-    applications = Application.query.all()
-    return render_template('admin/applications.html', applications=applications)
+    archived = request.args.get('archived', type=int) == 1
+    applications = ArchivedApplication.query.all() if archived else Application.query.all()
+    return render_template('admin/applications.html', applications=applications, archived=archived)
 
 # ==================== COMPANY ROUTES ====================
 
-@app.route('/company/dashboard')
+@bp.route('/company/dashboard')
 @login_required
 @company_required
 def company_dashboard():
@@ -387,7 +421,7 @@ def company_dashboard():
                            drives=drives,
                            total_applications=total_applications)
 
-@app.route('/company/profile', methods=['GET', 'POST'])
+@bp.route('/company/profile', methods=['GET', 'POST'])
 @login_required
 @company_required
 def company_profile():
@@ -402,11 +436,11 @@ def company_profile():
         company.description = request.form.get('description')
         db.session.commit()
         flash('Profile updated successfully.', 'success')
-        return redirect(url_for('company_profile'))
+        return redirect(url_for('main.company_profile'))
     
     return render_template('company/profile.html', company=company)
 
-@app.route('/company/drives')
+@bp.route('/company/drives')
 @login_required
 @company_required
 def company_drives():
@@ -414,7 +448,7 @@ def company_drives():
     drives = PlacementDrive.query.filter_by(company_id=company.id).all()
     return render_template('company/drives.html', drives=drives)
 
-@app.route('/company/drives/create', methods=['GET', 'POST'])
+@bp.route('/company/drives/create', methods=['GET', 'POST'])
 @login_required
 @company_required
 def create_drive():
@@ -422,7 +456,7 @@ def create_drive():
     
     if company.approval_status != 'approved':
         flash('Your company must be approved before creating drives.', 'danger')
-        return redirect(url_for('company_dashboard'))
+        return redirect(url_for('main.company_dashboard'))
     
     if request.method == 'POST':
         drive = PlacementDrive(
@@ -439,11 +473,11 @@ def create_drive():
         db.session.add(drive)
         db.session.commit()
         flash('Placement drive created successfully. Waiting for admin approval.', 'success')
-        return redirect(url_for('company_drives'))
+        return redirect(url_for('main.company_drives'))
     
     return render_template('company/create_drive.html')
 
-@app.route('/company/drives/<int:id>/edit', methods=['GET', 'POST'])
+@bp.route('/company/drives/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 @company_required
 def edit_drive(id):
@@ -463,11 +497,11 @@ def edit_drive(id):
         drive.application_deadline = datetime.strptime(request.form.get('application_deadline'), '%Y-%m-%d') if request.form.get('application_deadline') else None
         db.session.commit()
         flash('Placement drive updated successfully.', 'success')
-        return redirect(url_for('company_drives'))
+        return redirect(url_for('main.company_drives'))
     
     return render_template('company/edit_drive.html', drive=drive)
 
-@app.route('/company/drives/<int:id>/close', methods=['POST'])
+@bp.route('/company/drives/<int:id>/close', methods=['POST'])
 @login_required
 @company_required
 def close_drive(id):
@@ -480,9 +514,9 @@ def close_drive(id):
     drive.status = 'closed'
     db.session.commit()
     flash('Placement drive has been closed.', 'info')
-    return redirect(url_for('company_drives'))
+    return redirect(url_for('main.company_drives'))
 
-@app.route('/company/drives/<int:id>/delete', methods=['POST'])
+@bp.route('/company/drives/<int:id>/delete', methods=['POST'])
 @login_required
 @company_required
 def delete_drive(id):
@@ -492,12 +526,17 @@ def delete_drive(id):
     if drive.company_id != company.id:
         abort(403)
     
-    db.session.delete(drive)
-    db.session.commit()
-    flash('Placement drive has been deleted.', 'success')
-    return redirect(url_for('company_drives'))
+    if drive.applications.count() > current_app.config['BULK_DELETE_BACKGROUND_THRESHOLD']:
+        drive.status = 'closed'
+        db.session.commit()
+        run_in_background(current_app._get_current_object(), purge_drive, drive.id, chunk_size=current_app.config['BULK_DELETE_CHUNK_SIZE'])
+        flash('Placement drive deletion has been started in the background.', 'info')
+    else:
+        purge_drive(drive.id)
+        flash('Placement drive has been deleted.', 'success')
+    return redirect(url_for('main.company_drives'))
 
-@app.route('/company/drives/<int:id>/applications')
+@bp.route('/company/drives/<int:id>/applications')
 @login_required
 @company_required
 def drive_applications(id):
@@ -510,7 +549,7 @@ def drive_applications(id):
     applications = Application.query.filter_by(drive_id=drive.id).all()
     return render_template('company/applications.html', drive=drive, applications=applications)
 
-@app.route('/company/applications/<int:id>/status', methods=['POST'])
+@bp.route('/company/applications/<int:id>/status', methods=['POST'])
 @login_required
 @company_required
 def update_application_status(id):
@@ -526,11 +565,37 @@ def update_application_status(id):
         db.session.commit()
         flash(f'Application status updated to {new_status}.', 'success')
     
-    return redirect(url_for('drive_applications', id=application.drive_id))
+    return redirect(url_for('main.drive_applications', id=application.drive_id))
+
+@bp.route('/company/drives/<int:id>/resumes.zip')
+@login_required
+@company_required
+def drive_resumes_zip(id):
+    company = Company.query.filter_by(user_id=current_user.id).first()
+    drive = PlacementDrive.query.get_or_404(id)
+    
+    if drive.company_id != company.id:
+        abort(403)
+    
+    storage_dir = current_app.config['RESUME_STORAGE_DIR']
+    students = Student.query.join(Application).filter(
+        Application.drive_id == drive.id,
+        Student.resume_hash.isnot(None)
+    ).all()
+    entries = []
+    for student in students:
+        path = resume_path(storage_dir, student.resume_hash)
+        if os.path.exists(path):
+            extension = os.path.splitext(student.resume_filename or '')[1]
+            entries.append((f'{secure_filename(student.roll_number)}_{secure_filename(student.name)}{extension}', path))
+    
+    filename = secure_filename(f'{drive.job_title}_resumes.zip') or 'resumes.zip'
+    return Response(stream_zip(entries), mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
 
 # ==================== STUDENT ROUTES ====================
 
-@app.route('/student/dashboard')
+@bp.route('/student/dashboard')
 @login_required
 @student_required
 def student_dashboard():
@@ -549,7 +614,7 @@ def student_dashboard():
                            applications=applications,
                            applied_drive_ids=applied_drive_ids)
 
-@app.route('/student/profile', methods=['GET', 'POST'])
+@bp.route('/student/profile', methods=['GET', 'POST'])
 @login_required
 @student_required
 def student_profile():
@@ -561,13 +626,25 @@ def student_profile():
         student.branch = request.form.get('branch')
         student.cgpa = float(request.form.get('cgpa', 0))
         student.resume_url = request.form.get('resume_url')
+        
+        # A rejected file only skips the upload; the other edits are still saved
+        resume = request.files.get('resume')
+        if resume and resume.filename:
+            filename = secure_filename(resume.filename)
+            extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+            if extension in current_app.config['RESUME_ALLOWED_EXTENSIONS']:
+                student.resume_hash = save_resume(resume, current_app.config['RESUME_STORAGE_DIR'])
+                student.resume_filename = filename
+            else:
+                flash('Resume must be a PDF or Word document; the file was not uploaded.', 'danger')
+        
         db.session.commit()
         flash('Profile updated successfully.', 'success')
-        return redirect(url_for('student_profile'))
+        return redirect(url_for('main.student_profile'))
     
     return render_template('student/profile.html', student=student)
 
-@app.route('/student/drives')
+@bp.route('/student/drives')
 @login_required
 @student_required
 def student_drives():
@@ -583,7 +660,7 @@ def student_drives():
                            applied_drive_ids=applied_drive_ids,
                            student=student)
 
-@app.route('/student/drives/<int:id>/apply', methods=['POST'])
+@bp.route('/student/drives/<int:id>/apply', methods=['POST'])
 @login_required
 @student_required
 def apply_drive(id):
@@ -593,18 +670,18 @@ def apply_drive(id):
     # Check if drive is approved
     if drive.status != 'approved':
         flash('This drive is not available for applications.', 'danger')
-        return redirect(url_for('student_drives'))
+        return redirect(url_for('main.student_drives'))
     
     # Check if already applied
     existing = Application.query.filter_by(student_id=student.id, drive_id=drive.id).first()
     if existing:
         flash('You have already applied to this drive.', 'warning')
-        return redirect(url_for('student_drives'))
+        return redirect(url_for('main.student_drives'))
     
     # Check eligibility (CGPA)
     if student.cgpa < drive.min_cgpa:
         flash(f'You do not meet the minimum CGPA requirement of {drive.min_cgpa}.', 'danger')
-        return redirect(url_for('student_drives'))
+        return redirect(url_for('main.student_drives'))
     
     # Create application
     application = Application(
@@ -615,38 +692,132 @@ def apply_drive(id):
     db.session.add(application)
     db.session.commit()
     flash(f'Successfully applied to {drive.job_title}!', 'success')
-    return redirect(url_for('student_drives'))
+    return redirect(url_for('main.student_drives'))
 
-@app.route('/student/history')
+@bp.route('/student/history')
 @login_required
 @student_required
 def student_history():
     student = Student.query.filter_by(user_id=current_user.id).first()
-    applications = Application.query.filter_by(student_id=student.id).order_by(Application.applied_at.desc()).all()
+    applications = Application.query.filter_by(student_id=student.id).all()
+    # Past seasons live in the archive tables but still belong in the history
+    applications += ArchivedApplication.query.filter_by(student_id=student.id).all()
+    applications.sort(key=lambda application: application.applied_at, reverse=True)
     return render_template('student/history.html', applications=applications)
 
+# ==================== RESUMES ====================
+
+def can_view_resume(student):
+    if current_user.role == 'admin':
+        return True
+    if current_user.role == 'student':
+        return student.user_id == current_user.id
+    company = Company.query.filter_by(user_id=current_user.id).first()
+    # Companies may only see resumes of students who applied to their drives
+    applied = Application.query.join(PlacementDrive).filter(
+        Application.student_id == student.id,
+        PlacementDrive.company_id == company.id
+    ).first()
+    if applied is None:
+        applied = ArchivedApplication.query.join(ArchivedPlacementDrive).filter(
+            ArchivedApplication.student_id == student.id,
+            ArchivedPlacementDrive.company_id == company.id
+        ).first()
+    return applied is not None
+
+@bp.route('/students/<int:id>/resume/<digest>')
+@login_required
+def student_resume(id, digest):
+    student = Student.query.get_or_404(id)
+    
+    if student.resume_hash != digest:
+        abort(404)
+    if not can_view_resume(student):
+        abort(403)
+    
+    path = resume_path(current_app.config['RESUME_STORAGE_DIR'], digest)
+    if not os.path.exists(path):
+        abort(404)
+    
+    # send_file handles Range and conditional requests and hands the file to
+    # the server's sendfile support via wsgi.file_wrapper
+    response = send_file(path, download_name=student.resume_filename or f'{student.roll_number}_resume',
+                         conditional=True, etag=digest,
+                         max_age=current_app.config['RESUME_CACHE_MAX_AGE'])
+    # The URL is content-addressed, so the file can be cached forever, but only privately
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
+
+# ==================== SYNC API ====================
+
+@bp.route('/api/changes')
+@login_required
+@admin_required
+def change_feed():
+    since = request.args.get('since', 0, type=int)
+    limit = min(max(request.args.get('limit', current_app.config['CHANGE_FEED_PAGE_SIZE'], type=int), 1),
+                current_app.config['CHANGE_FEED_MAX_PAGE_SIZE'])
+    
+    # Fetch one extra row to know whether another page follows
+    changes = ChangeLog.query.filter(ChangeLog.id > since).order_by(ChangeLog.id).limit(limit + 1).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    # Load current state of upserted rows with one query per entity
+    upserted = {}
+    for change in changes:
+        if change.operation == 'upsert':
+            upserted.setdefault(change.entity, set()).add(change.entity_id)
+    rows = {}
+    archived = set()
+    for entity, ids in upserted.items():
+        model = TRACKED_MODELS[entity]
+        found = set()
+        for obj in model.query.filter(model.id.in_(ids)).all():
+            rows[(entity, obj.id)] = obj.to_dict()
+            found.add(obj.id)
+        # Rows moved by archive.py are still current, just no longer live
+        missing = ids - found
+        if missing and entity in ARCHIVE_MODELS:
+            archive_model = ARCHIVE_MODELS[entity]
+            for obj in archive_model.query.filter(archive_model.id.in_(missing)).all():
+                rows[(entity, obj.id)] = obj.to_dict()
+                archived.add((entity, obj.id))
+    
+    items = []
+    for change in changes:
+        item = change.to_dict()
+        key = (change.entity, change.entity_id)
+        # Rows deleted since are reported with null data; their tombstone
+        # follows later in the feed
+        item['data'] = rows.get(key) if change.operation == 'upsert' else None
+        item['archived'] = key in archived
+        items.append(item)
+    
+    return jsonify({
+        'changes': items,
+        'next_cursor': changes[-1].id if changes else since,
+        'has_more': has_more
+    })
+
 # ==================== ERROR HANDLERS ====================
 
-@app.errorhandler(403)
+@bp.app_errorhandler(403)
 def forbidden(e):
     return render_template('errors/403.html'), 403
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(e):
     return render_template('errors/404.html'), 404
 
+@bp.app_errorhandler(413)
+def request_too_large(e):
+    return render_template('errors/413.html'), 413
+
 # ==================== MAIN ====================
 
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-        # Create admin if not exists
-        admin = User.query.filter_by(email='admin@portal.com').first()
-        if not admin:
-            admin = User(email='admin@portal.com', role='admin', is_active=True)
-            admin.set_password('admin123')
-            db.session.add(admin)
-            db.session.commit()
-            print("Admin user created: admin@portal.com / admin123")
-    
-    app.run(debug=True)
+    # Development server only; production runs wsgi.py under gunicorn
+    create_app('development').run()
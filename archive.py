@@ -0,0 +1,40 @@
+import argparse
+from datetime import datetime
+from app import create_app
+from maintenance import archive_drives, restore_drives
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive or restore closed placement drives from past seasons.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    archive_parser = subparsers.add_parser('archive', help='Move closed drives created before a date to the archive')
+    archive_parser.add_argument('--before', type=parse_date, required=True, help='Cutoff date (YYYY-MM-DD)')
+    archive_parser.add_argument('--chunk-size', type=int, default=100, help='Drives moved per transaction')
+
+    restore_parser = subparsers.add_parser('restore', help='Move archived drives back to the live tables')
+    restore_parser.add_argument('--drive', type=int, action='append', dest='drive_ids', help='Drive id to restore (repeatable)')
+    restore_parser.add_argument('--before', type=parse_date, help='Only restore drives created before this date')
+    restore_parser.add_argument('--all', action='store_true', help='Restore the whole archive')
+    restore_parser.add_argument('--chunk-size', type=int, default=100, help='Drives moved per transaction')
+
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.command == 'archive':
+            count = archive_drives(args.before, chunk_size=args.chunk_size)
+            print(f"Archived {count} drive(s) created before {args.before.date()}.")
+        else:
+            if not (args.drive_ids or args.before or args.all):
+                parser.error('restore needs --drive, --before or --all')
+            count = restore_drives(args.drive_ids, args.before, chunk_size=args.chunk_size)
+            print(f"Restored {count} drive(s).")
+
+
+if __name__ == '__main__':
+    main()
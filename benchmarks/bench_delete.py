@@ -0,0 +1,80 @@
+"""Compare ORM-cascade and set-based deletion of a company with many applications.
+
+Usage: python benchmarks/bench_delete.py [applications]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from models import db, User, Student, Company, PlacementDrive, Application
+from maintenance import purge_company
+
+DRIVES = 50
+
+
+def make_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(total_applications):
+    """Create one company whose drives hold total_applications applications."""
+    per_drive = total_applications // DRIVES
+    users = [{'email': f'student{i}@bench', 'password_hash': '-', 'role': 'student'} for i in range(per_drive)]
+    users.append({'email': 'hr@bench', 'password_hash': '-', 'role': 'company'})
+    db.session.execute(User.__table__.insert(), users)
+    company_user = User.query.filter_by(email='hr@bench').first()
+    db.session.execute(Student.__table__.insert(), [
+        {'user_id': i + 1, 'name': f'Student {i}', 'roll_number': f'R{i}'} for i in range(per_drive)
+    ])
+    db.session.execute(Company.__table__.insert(), [{'user_id': company_user.id, 'name': 'Bench Corp'}])
+    company = Company.query.filter_by(name='Bench Corp').first()
+    db.session.execute(PlacementDrive.__table__.insert(), [
+        {'company_id': company.id, 'job_title': f'Role {d}', 'status': 'approved'} for d in range(DRIVES)
+    ])
+    drive_ids = [d.id for d in PlacementDrive.query.filter_by(company_id=company.id)]
+    db.session.execute(Application.__table__.insert(), [
+        {'student_id': s + 1, 'drive_id': drive_id, 'status': 'applied'}
+        for drive_id in drive_ids for s in range(per_drive)
+    ])
+    db.session.commit()
+    return company.id
+
+
+def orm_delete(company_id):
+    company = db.session.get(Company, company_id)
+    user = db.session.get(User, company.user_id)
+    db.session.delete(company)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def run(label, total_applications, delete):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            db.create_all()
+            company_id = seed(total_applications)
+            db.session.expunge_all()
+            start = time.perf_counter()
+            delete(company_id)
+            elapsed = time.perf_counter() - start
+            remaining = Application.query.count()
+            db.session.remove()
+            db.engine.dispose()
+    print(f'{label:<28} {elapsed:8.3f}s  (applications left: {remaining})')
+
+
+if __name__ == '__main__':
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f'Deleting a company with {total} applications across {DRIVES} drives')
+    run('ORM cascade', total, orm_delete)
+    run('bulk DELETE', total, purge_company)
+    run('bulk DELETE, 2000-row chunks', total, lambda company_id: purge_company(company_id, chunk_size=2000))
@@ -0,0 +1,52 @@
+"""Measure first-request latency of a fresh worker with and without template caching.
+
+Each scenario runs in its own process so nothing is compiled beforehand.
+Usage: python benchmarks/bench_templates.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Anonymous pages, so no database is needed
+PAGES = ['/', '/login', '/register/student', '/register/company']
+
+
+def measure(mode, cache_dir):
+    """Build an app configured for mode and print startup and first-request times."""
+    from app import create_app
+    from config import config
+
+    settings = config['production']
+    settings.TEMPLATE_WARMUP = mode in ('warmup', 'warmup+cache')
+    settings.TEMPLATE_BYTECODE_CACHE_DIR = cache_dir if mode in ('cache', 'warmup+cache') else None
+
+    start = time.perf_counter()
+    app = create_app('production')
+    startup = time.perf_counter() - start
+
+    client = app.test_client()
+    first = []
+    for page in PAGES:
+        start = time.perf_counter()
+        client.get(page)
+        first.append(time.perf_counter() - start)
+    print(f'{mode:<14} startup {startup * 1000:7.1f}ms   first requests {sum(first) * 1000:7.1f}ms '
+          f'(max {max(first) * 1000:.1f}ms)')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+        sys.exit()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Populate the bytecode cache as a previous deploy would have
+        subprocess.run([sys.executable, __file__, 'warmup+cache', cache_dir], cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        print(f'First request to {len(PAGES)} pages in a fresh process')
+        for mode in ('none', 'cache', 'warmup', 'warmup+cache'):
+            subprocess.run([sys.executable, __file__, mode, cache_dir], cwd=ROOT, check=True)
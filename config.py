@@ -4,5 +4,45 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'placement-portal-secret-key-2026'
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'placement_portal.db')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///' + os.path.join(basedir, 'placement_portal.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # The feed cursor is the change_log id. It is only gap-free because SQLite
+    # has a single writer; on a server database ids can commit out of order
+    # and a client paging by cursor may skip rows.
+    CHANGE_FEED_PAGE_SIZE = 500
+    CHANGE_FEED_MAX_PAGE_SIZE = 5000
+    # Deletes touching more applications than this run as a chunked background job
+    BULK_DELETE_BACKGROUND_THRESHOLD = 10000
+    BULK_DELETE_CHUNK_SIZE = 2000
+    # Opt-in persistent cache of compiled templates, shared across restarts
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR')
+    # Compile all templates in create_app instead of on first use
+    TEMPLATE_WARMUP = False
+    RESUME_STORAGE_DIR = os.environ.get('RESUME_STORAGE_DIR') or os.path.join(basedir, 'uploads', 'resumes')
+    RESUME_ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+    RESUME_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+    MAX_CONTENT_LENGTH = 10 * 1024 * 1024
+
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+
+class ProductionConfig(Config):
+    DEBUG = False
+    TEMPLATES_AUTO_RELOAD = False
+    # With gunicorn's preload_app the compiled templates are inherited by every worker
+    TEMPLATE_WARMUP = True
+    # Worker processes share the SQLite file; wait for the write lock instead
+    # of failing. 'timeout' is a sqlite3 argument that server drivers reject.
+    if Config.SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'connect_args': {'timeout': 30},
+        }
+
+
+config = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'default': DevelopmentConfig,
+}
@@ -0,0 +1,32 @@
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+# SQLite serializes writers across processes, and the bulk delete and
+# archive jobs hold the write lock per chunk, so extra workers only queue on
+# the database lock. Keep the default small on SQLite; scale with
+# WEB_CONCURRENCY once DATABASE_URL points at a server database. Note that
+# the /api/changes cursor is only gap-free under SQLite's single writer.
+if os.environ.get('DATABASE_URL', 'sqlite').startswith('sqlite'):
+    default_workers = 2
+else:
+    default_workers = multiprocessing.cpu_count() * 2 + 1
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+# Threaded workers keep heartbeating the master while a thread streams a
+# long response. A sync worker sends none while it writes out the "Download
+# All Resumes" ZIP, so a download longer than `timeout` would get the worker
+# killed and leave a truncated archive, and it would tie up a whole worker
+# for the duration.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# Import the app once in the master so forked workers start warm
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared with the workers;
+    # drop them from the pool without closing the parent's sockets
+    from wsgi import app
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -1,10 +1,45 @@
-from app import app, db
-from models import User
+import sys
+from sqlalchemy import inspect, text
+from app import create_app
+from models import db, User
 
-def init_database():
+def upgrade_schema():
+    """Add columns and indexes introduced after a table was first created.
+
+    create_all() only creates missing tables, so databases from earlier
+    versions need this to pick up new columns. Safe to run repeatedly.
+    """
+    inspector = inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    print(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+            
+            # SQLite can't add AUTOINCREMENT to an existing table
+            if db.engine.dialect.name == 'sqlite' and table.dialect_options['sqlite'].get('autoincrement'):
+                sql = connection.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                         {'name': table.name}).scalar()
+                if 'AUTOINCREMENT' not in sql.upper():
+                    print(f"Warning: {table.name} was created without AUTOINCREMENT, so ids of deleted or "
+                          f"archived rows may be reused. Recreate the database to fix this (its data is lost).")
+
+def init_database(config_name=None):
+    app = create_app(config_name)
     with app.app_context():
-        # Create all tables
+        # Create missing tables, then bring existing ones up to date
         db.create_all()
+        upgrade_schema()
+        
+        # WAL lets readers in other worker processes proceed during writes;
+        # the journal mode is stored in the database file
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(text('PRAGMA journal_mode=WAL'))
         
         # Check if admin already exists
         admin = User.query.filter_by(email='admin@portal.com').first()
@@ -26,4 +61,4 @@ def init_database():
         print("Database initialized successfully!")
 
 if __name__ == '__main__':
-    init_database()
+    init_database(sys.argv[1] if len(sys.argv) > 1 else None)
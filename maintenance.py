@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, insert, update, delete, literal, true
+from models import (db, User, Student, Company, PlacementDrive, Application, ChangeLog,
+                    ArchivedPlacementDrive, ArchivedApplication)
+
+# ==================== BULK DELETES ====================
+# Set-based replacements for the ORM cascades, which load every child row
+# into the session and delete them one at a time.
+
+def _record_changes(model, condition, operation, entity=None):
+    """Write a change-feed entry for every matching row with one INSERT ... SELECT."""
+    db.session.execute(insert(ChangeLog).from_select(
+        ['entity', 'entity_id', 'operation', 'changed_at'],
+        select(literal(entity or model.__tablename__), model.id, literal(operation), literal(datetime.utcnow())).where(condition)
+    ))
+
+
+def _tombstone_and_delete(model, condition, entity=None):
+    """Record change-feed tombstones for matching rows, then delete them in one statement."""
+    _record_changes(model, condition, 'delete', entity)
+    return db.session.execute(delete(model.__table__).where(condition)).rowcount
+
+
+def _delete_in_chunks(model, condition, chunk_size):
+    """Delete matching rows in batches, committing after each one to keep write locks short."""
+    total = 0
+    while True:
+        ids = db.session.execute(select(model.id).where(condition).limit(chunk_size)).scalars().all()
+        if not ids:
+            return total
+        total += _tombstone_and_delete(model, model.id.in_(ids))
+        db.session.commit()
+
+
+def _delete_applications(condition, chunk_size=None):
+    total = 0
+    if chunk_size:
+        total = _delete_in_chunks(Application, condition, chunk_size)
+    # Also runs after the chunks, in the caller's final transaction, so rows
+    # committed after the last (unlocked) chunk select are removed together
+    # with their parent rows
+    return total + _tombstone_and_delete(Application, condition)
+
+
+def suspend_company(company_id):
+    """Lock a company out ahead of a background purge.
+
+    Deactivates its account, closes its drives so students can no longer
+    apply, and flags it as pending deletion, all in one transaction.
+    """
+    company = db.session.get(Company, company_id)
+    company.deletion_pending = True
+    if company.user:
+        company.user.is_active = False
+    open_drives = (PlacementDrive.company_id == company_id) & (PlacementDrive.status != 'closed')
+    _record_changes(PlacementDrive, open_drives, 'upsert')
+    db.session.execute(update(PlacementDrive.__table__).where(open_drives).values(
+        status='closed', updated_at=datetime.utcnow()
+    ))
+    db.session.commit()
+
+
+def purge_company(company_id, chunk_size=None):
+    """Delete a company with its user account, drives and applications.
+
+    Without chunk_size everything runs in a single transaction; with it the
+    applications are removed in batches first. Safe to re-run after an
+    interrupted background job.
+    """
+    company = db.session.get(Company, company_id)
+    if company is None:
+        return
+    user_id = company.user_id
+    drive_ids = select(PlacementDrive.id).where(PlacementDrive.company_id == company_id)
+    archived_drive_ids = select(ArchivedPlacementDrive.id).where(ArchivedPlacementDrive.company_id == company_id)
+
+    _delete_applications(Application.drive_id.in_(drive_ids), chunk_size)
+    _tombstone_and_delete(PlacementDrive, PlacementDrive.company_id == company_id)
+    _tombstone_and_delete(ArchivedApplication, ArchivedApplication.drive_id.in_(archived_drive_ids), 'applications')
+    _tombstone_and_delete(ArchivedPlacementDrive, ArchivedPlacementDrive.company_id == company_id, 'placement_drives')
+    _tombstone_and_delete(Company, Company.id == company_id)
+    _tombstone_and_delete(User, User.id == user_id)
+    db.session.commit()
+
+
+def purge_student(student_id, chunk_size=None):
+    """Delete a student with their user account and applications."""
+    student = db.session.get(Student, student_id)
+    if student is None:
+        return
+    user_id = student.user_id
+
+    _delete_applications(Application.student_id == student_id, chunk_size)
+    _tombstone_and_delete(ArchivedApplication, ArchivedApplication.student_id == student_id, 'applications')
+    _tombstone_and_delete(Student, Student.id == student_id)
+    _tombstone_and_delete(User, User.id == user_id)
+    db.session.commit()
+
+
+def purge_drive(drive_id, chunk_size=None):
+    """Delete a placement drive with its applications."""
+    _delete_applications(Application.drive_id == drive_id, chunk_size)
+    _tombstone_and_delete(PlacementDrive, PlacementDrive.id == drive_id)
+    db.session.commit()
+
+
+# ==================== ARCHIVAL ====================
+# Rows keep their ids when moved. Each move writes change-feed upserts under
+# the live table names in the same transaction; the feed serves archived rows
+# from the archive tables with an archived flag.
+
+def _move_rows(source, target, condition):
+    # Copy only the shared columns; archive tables add archived_at
+    columns = [column.name for column in source.__table__.columns if column.name in target.__table__.columns]
+    db.session.execute(insert(target.__table__).from_select(
+        columns, select(*[source.__table__.columns[name] for name in columns]).where(condition)
+    ))
+    db.session.execute(delete(source.__table__).where(condition))
+
+
+def archive_drives(before, chunk_size=100):
+    """Move closed drives created before the cutoff, with their applications, to the archive.
+
+    Each batch of chunk_size drives is moved in its own transaction.
+    Returns the number of drives archived.
+    """
+    condition = (PlacementDrive.status == 'closed') & (PlacementDrive.created_at < before)
+    total = 0
+    while True:
+        ids = db.session.execute(select(PlacementDrive.id).where(condition).limit(chunk_size)).scalars().all()
+        if not ids:
+            return total
+        _record_changes(PlacementDrive, PlacementDrive.id.in_(ids), 'upsert')
+        _record_changes(Application, Application.drive_id.in_(ids), 'upsert')
+        _move_rows(PlacementDrive, ArchivedPlacementDrive, PlacementDrive.id.in_(ids))
+        _move_rows(Application, ArchivedApplication, Application.drive_id.in_(ids))
+        db.session.commit()
+        total += len(ids)
+
+
+def restore_drives(drive_ids=None, before=None, chunk_size=100):
+    """Move archived drives and their applications back into the live tables.
+
+    Restores the given drive ids, or every drive created before the cutoff,
+    or the whole archive when neither is given. Returns the number restored.
+    """
+    condition = true()
+    if drive_ids:
+        condition = ArchivedPlacementDrive.id.in_(drive_ids)
+    if before is not None:
+        condition = condition & (ArchivedPlacementDrive.created_at < before)
+    total = 0
+    while True:
+        ids = db.session.execute(select(ArchivedPlacementDrive.id).where(condition).limit(chunk_size)).scalars().all()
+        if not ids:
+            return total
+        _record_changes(ArchivedPlacementDrive, ArchivedPlacementDrive.id.in_(ids), 'upsert', 'placement_drives')
+        _record_changes(ArchivedApplication, ArchivedApplication.drive_id.in_(ids), 'upsert', 'applications')
+        _move_rows(ArchivedPlacementDrive, PlacementDrive, ArchivedPlacementDrive.id.in_(ids))
+        _move_rows(ArchivedApplication, Application, ArchivedApplication.drive_id.in_(ids))
+        db.session.commit()
+        total += len(ids)
+
+
+# ==================== RESUME CLEANUP ====================
+
+def sweep_resumes(grace_period):
+    """Delete stored resumes no student references, plus abandoned partial uploads.
+
+    Only files untouched for grace_period seconds are removed. save_resume
+    touches an existing file when a new upload has the same content, so a
+    file about to be referenced by an uncommitted row is never swept.
+    Returns the number of files removed.
+    """
+    storage_dir = current_app.config['RESUME_STORAGE_DIR']
+    referenced = set(db.session.execute(
+        select(Student.resume_hash).where(Student.resume_hash.isnot(None)).distinct()
+    ).scalars())
+    cutoff = time.time() - grace_period
+    removed = 0
+    for dirpath, dirnames, filenames in os.walk(storage_dir):
+        for name in filenames:
+            if name in referenced:
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+    return removed
+
+
+def run_in_background(app, func, *args, **kwargs):
+    """Run func inside an application context on a daemon thread."""
+    def target():
+        with app.app_context():
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('Background job %s failed', func.__name__)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
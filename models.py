@@ -1,11 +1,36 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
 db = SQLAlchemy()
 
-class User(UserMixin, db.Model):
+
+class SyncMixin:
+    """JSON serialization of a row for the change feed."""
+    # Columns never exposed to downstream sync
+    sync_excluded_columns = ()
+    
+    def to_dict(self):
+        data = {}
+        for column in self.__table__.columns:
+            if column.name in self.sync_excluded_columns:
+                continue
+            value = getattr(self, column.name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            data[column.name] = value
+        return data
+
+
+class TrackedMixin(SyncMixin):
+    """Adds an updated_at timestamp to rows reported by the change feed."""
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+
+class User(TrackedMixin, UserMixin, db.Model):
     __tablename__ = 'users'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -15,6 +40,8 @@ class User(UserMixin, db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    sync_excluded_columns = ('password_hash',)
+    
     # Relationships
     student = db.relationship('Student', backref='user', uselist=False, cascade='all, delete-orphan')
     company = db.relationship('Company', backref='user', uselist=False, cascade='all, delete-orphan')
@@ -29,7 +56,7 @@ class User(UserMixin, db.Model):
         return f'<User {self.email}>'
 
 
-class Student(db.Model):
+class Student(TrackedMixin, db.Model):
     __tablename__ = 'students'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -40,6 +67,8 @@ class Student(db.Model):
     branch = db.Column(db.String(50))
     cgpa = db.Column(db.Float, default=0.0)
     resume_url = db.Column(db.String(255))
+    resume_hash = db.Column(db.String(64))  # SHA-256 of the uploaded file, see storage.py
+    resume_filename = db.Column(db.String(255))
     is_blacklisted = db.Column(db.Boolean, default=False)
     
     # Relationships
@@ -49,7 +78,7 @@ class Student(db.Model):
         return f'<Student {self.name}>'
 
 
-class Company(db.Model):
+class Company(TrackedMixin, db.Model):
     __tablename__ = 'companies'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -62,6 +91,7 @@ class Company(db.Model):
     description = db.Column(db.Text)
     approval_status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
     is_blacklisted = db.Column(db.Boolean, default=False)
+    deletion_pending = db.Column(db.Boolean, default=False)  # set while a background purge runs
     
     # Relationships
     placement_drives = db.relationship('PlacementDrive', backref='company', lazy='dynamic', cascade='all, delete-orphan')
@@ -70,11 +100,11 @@ class Company(db.Model):
         return f'<Company {self.name}>'
 
 
-class PlacementDrive(db.Model):
+class PlacementDrive(TrackedMixin, db.Model):
     __tablename__ = 'placement_drives'
     
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False, index=True)
     job_title = db.Column(db.String(100), nullable=False)
     job_description = db.Column(db.Text)
     eligibility_criteria = db.Column(db.Text)
@@ -88,21 +118,142 @@ class PlacementDrive(db.Model):
     # Relationships
     applications = db.relationship('Application', backref='drive', lazy='dynamic', cascade='all, delete-orphan')
     
+    __table_args__ = ({'sqlite_autoincrement': True},)
+    
     def __repr__(self):
         return f'<PlacementDrive {self.job_title}>'
 
 
-class Application(db.Model):
+class Application(TrackedMixin, db.Model):
     __tablename__ = 'applications'
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
-    drive_id = db.Column(db.Integer, db.ForeignKey('placement_drives.id'), nullable=False)
+    drive_id = db.Column(db.Integer, db.ForeignKey('placement_drives.id'), nullable=False, index=True)
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='applied')  # applied, shortlisted, selected, rejected
     
-    # Unique constraint to prevent duplicate applications
-    __table_args__ = (db.UniqueConstraint('student_id', 'drive_id', name='unique_student_drive'),)
+    # Unique constraint to prevent duplicate applications; AUTOINCREMENT keeps
+    # ids of archived rows from being reused
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'drive_id', name='unique_student_drive'),
+        {'sqlite_autoincrement': True},
+    )
     
     def __repr__(self):
         return f'<Application {self.id}>'
+
+
+# ==================== ARCHIVE ====================
+# Closed drives and their applications from past seasons are moved here by
+# archive.py. Rows keep their original ids and columns so they can be restored.
+
+class ArchivedPlacementDrive(SyncMixin, db.Model):
+    __tablename__ = 'archived_placement_drives'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False, index=True)
+    job_title = db.Column(db.String(100), nullable=False)
+    job_description = db.Column(db.Text)
+    eligibility_criteria = db.Column(db.Text)
+    min_cgpa = db.Column(db.Float, default=0.0)
+    branches_allowed = db.Column(db.String(255))
+    package_lpa = db.Column(db.Float)
+    application_deadline = db.Column(db.DateTime)
+    status = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    
+    sync_excluded_columns = ('archived_at',)
+    
+    # Relationships
+    company = db.relationship('Company')
+    applications = db.relationship('ArchivedApplication', backref='drive', lazy='dynamic')
+    
+    def __repr__(self):
+        return f'<ArchivedPlacementDrive {self.job_title}>'
+
+
+class ArchivedApplication(SyncMixin, db.Model):
+    __tablename__ = 'archived_applications'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
+    drive_id = db.Column(db.Integer, db.ForeignKey('archived_placement_drives.id'), nullable=False, index=True)
+    applied_at = db.Column(db.DateTime)
+    status = db.Column(db.String(20))
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    
+    sync_excluded_columns = ('archived_at',)
+    
+    # Relationships
+    student = db.relationship('Student')
+    
+    def __repr__(self):
+        return f'<ArchivedApplication {self.id}>'
+
+
+class ChangeLog(db.Model):
+    """Append-only log of row changes; the id is the monotonic sync cursor."""
+    __tablename__ = 'change_log'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(30), nullable=False)  # table name of the changed row
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)  # upsert, delete
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # AUTOINCREMENT so ids are never reused and the cursor stays monotonic
+    __table_args__ = ({'sqlite_autoincrement': True},)
+    
+    def to_dict(self):
+        return {
+            'cursor': self.id,
+            'entity': self.entity,
+            'entity_id': self.entity_id,
+            'operation': self.operation,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None,
+        }
+
+
+# ==================== CHANGE TRACKING ====================
+
+TRACKED_MODELS = {model.__tablename__: model for model in (User, Student, Company, PlacementDrive, Application)}
+
+# Where the change feed finds rows of a tracked table after archive.py moved them
+ARCHIVE_MODELS = {
+    PlacementDrive.__tablename__: ArchivedPlacementDrive,
+    Application.__tablename__: ArchivedApplication,
+}
+
+
+def record_change(connection, entity, entity_id, operation):
+    connection.execute(ChangeLog.__table__.insert().values(
+        entity=entity,
+        entity_id=entity_id,
+        operation=operation,
+        changed_at=datetime.utcnow()
+    ))
+
+
+def _register_change_listeners(model):
+    @event.listens_for(model, 'after_insert')
+    def after_insert(mapper, connection, target):
+        record_change(connection, model.__tablename__, target.id, 'upsert')
+    
+    @event.listens_for(model, 'after_update')
+    def after_update(mapper, connection, target):
+        # Dirty objects without net column changes still reach this hook
+        if not object_session(target).is_modified(target, include_collections=False):
+            return
+        record_change(connection, model.__tablename__, target.id, 'upsert')
+    
+    @event.listens_for(model, 'after_delete')
+    def after_delete(mapper, connection, target):
+        record_change(connection, model.__tablename__, target.id, 'delete')
+
+
+for _model in TRACKED_MODELS.values():
+    _register_change_listeners(_model)
@@ -0,0 +1,148 @@
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from flask import Request, current_app
+
+CHUNK_SIZE = 64 * 1024
+
+# ==================== RESUME STORAGE ====================
+# Files are stored under their SHA-256 digest, so identical uploads are kept
+# once and a stored file never changes. Unreferenced files are only removed
+# by maintenance.sweep_resumes, never inline.
+
+def resume_path(storage_dir, digest):
+    return os.path.join(storage_dir, digest[:2], digest)
+
+
+class HashingFile(io.FileIO):
+    """Spool file for an upload that hashes the content as it is written.
+
+    Created in the storage directory, so a new resume only has to be renamed
+    into place. Removed on close unless save_resume claimed it.
+    """
+
+    def __init__(self, storage_dir):
+        os.makedirs(storage_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=storage_dir, prefix='.upload-')
+        super().__init__(fd, 'w+b')
+        self.sha256 = hashlib.sha256()
+        self.claimed = False
+
+    def write(self, data):
+        self.sha256.update(data)
+        view = memoryview(data)
+        while view:
+            view = view[super().write(view):]
+        return len(data)
+
+    def close(self):
+        super().close()
+        if not self.claimed:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class UploadRequest(Request):
+    """Request that spools uploaded files into the resume store.
+
+    Werkzeug's multipart parser still reads the body in chunks, but each
+    file part goes to a HashingFile rather than its default spooled
+    temporary file, so an upload is written to disk once and never held
+    in memory whole.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingFile(current_app.config['RESUME_STORAGE_DIR'])
+
+
+def _store(tmp_path, digest, storage_dir):
+    """Move a fully written temp file to its content address."""
+    path = resume_path(storage_dir, digest)
+    try:
+        # Touch the existing copy so sweep_resumes leaves it alone until
+        # the row referencing it has been committed
+        os.utime(path)
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+
+
+def save_resume(file, storage_dir):
+    """Store an uploaded file under its SHA-256 digest and return the digest.
+
+    Uploads parsed by UploadRequest are already on disk and hashed, so they
+    are just renamed into place. Other file objects are copied in chunks.
+    """
+    stream = file.stream
+    if isinstance(stream, HashingFile):
+        stream.claimed = True
+        # Close before renaming; open files can't be renamed on Windows
+        stream.close()
+        digest = stream.sha256.hexdigest()
+        _store(stream.path, digest, storage_dir)
+        return digest
+
+    os.makedirs(storage_dir, exist_ok=True)
+    sha256 = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=storage_dir, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                out.write(chunk)
+        digest = sha256.hexdigest()
+        _store(tmp_path, digest, storage_dir)
+        return digest
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class _ZipBuffer:
+    """Write-only sink that hands written bytes back to the ZIP generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries):
+    """Yield a ZIP archive of (archive_name, path) entries without building it in memory.
+
+    The sink is not seekable, so zipfile writes data descriptors after each
+    member and only one chunk is held at a time. Members are stored
+    uncompressed; resumes are mostly PDFs that don't shrink further.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for name, path in entries:
+            info = zipfile.ZipInfo.from_file(path, arcname=name)
+            with open(path, 'rb') as src, archive.open(info, 'w') as dest:
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    yield buffer.pop()
+            yield buffer.pop()
+    yield buffer.pop()
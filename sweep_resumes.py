@@ -0,0 +1,19 @@
+import argparse
+from app import create_app
+from maintenance import sweep_resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Delete stored resumes that no student references any more.')
+    parser.add_argument('--grace-hours', type=float, default=24,
+                        help='Only remove files untouched for this many hours')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        count = sweep_resumes(args.grace_hours * 60 * 60)
+        print(f"Removed {count} unreferenced file(s).")
+
+
+if __name__ == '__main__':
+    main()